@@ -80,6 +80,72 @@ xf_env = {
     }
 }
 
+# refs shared by the columns below
+ms_table_rf = Rf("ms_table")
+std_key_rf = Rf("ms_sample_name", "std_conc")
+qc_key_rf = Rf("qc_label", "qc_conc")
+
+
+def std_accuracy(v, env):
+    return float(v) / float(env["std_conc"])  # accuracy as a fraction
+
+
+def qc_accuracy(v, env):
+    return float(v) / float(env["qc_conc"])  # accuracy as a fraction
+
+
+def std_curve_columns(row_offsets, table_rf=ms_table_rf, header_prefix=""):
+    """Calculated Concentration and Accuracy columns for each STD curve, curve n read from row_offset n - 1.
+
+    For a multi-analyte panel, call once per analyte with that analyte's table ref and a header prefix.
+    """
+    columns = []
+    for row_offset in row_offsets:
+        curve = row_offset + 1
+        columns += [
+            {
+                "header": f"{header_prefix}Curve {curve} - Calculated Concentration (nM)",
+                "xf":     TableValue(table_rf, std_key_rf, "Calculated Conc", row_offset=row_offset)
+            },
+            {
+                "header": f"{header_prefix}Curve {curve} - Accuracy (%)",
+                "xf":     TableValue(table_rf, std_key_rf, "Calculated Conc", row_offset=row_offset,
+                                     xf_env=std_accuracy),
+            },
+        ]
+    return columns
+
+
+def qc_replicate_columns(replicates, table_rf=ms_table_rf, header_prefix=""):
+    """Calculated Concentration and Accuracy columns for each QC replicate, read from row_offset replicate - 1"""
+    columns = []
+    for replicate in replicates:
+        columns += [
+            {
+                "header": f"{header_prefix}{replicate} - Calculated Concentration (nM)",
+                "xf": TableValue(
+                    table_rf,
+                    qc_key_rf,
+                    "Calculated Conc",
+                    cmp=b_starts_with_a,  # if we give you ULQC, and you see ULQC_#, give us that row
+                    row_offset=replicate - 1,
+                )
+            },
+            {
+                "header": f"{header_prefix}{replicate} - Accuracy (%)",
+                "xf": TableValue(
+                    table_rf,
+                    qc_key_rf,
+                    "Calculated Conc",
+                    cmp=b_starts_with_a,
+                    row_offset=replicate - 1,
+                    xf_env=qc_accuracy
+                ),
+            },
+        ]
+    return columns
+
+
 std_replicate_sheet_def = {
     "sheet_name": "STD Calibration Curves",
 
@@ -105,38 +171,8 @@ std_replicate_sheet_def = {
             "xf":     EnvRef("std_conc", xf=lambda v: f"{float(v):0.1f}")  # example of xf formatting
         },
 
-        {
-            "header": "Curve 1 - Calculated Concentration (nM)",
-            "xf":     TableValue(Rf("ms_table"), Rf("ms_sample_name", "std_conc"), "Calculated Conc", row_offset=0)
-        },
-
-        {
-            "header": "Curve 1 - Accuracy (%)",
-            "xf":     TableValue(Rf("ms_table"), Rf("ms_sample_name", "std_conc"), "Calculated Conc", row_offset=0,
-                                 xf_env=lambda v, env: float(v) / float(env["std_conc"])),
-        },
-
-        {
-            "header": "Curve 2 - Calculated Concentration (nM)",
-            "xf":     TableValue(Rf("ms_table"), Rf("ms_sample_name", "std_conc"), "Calculated Conc", row_offset=1)
-        },
-
-        {
-            "header": "Curve 2 - Accuracy (%)",
-            "xf":     TableValue(Rf("ms_table"), Rf("ms_sample_name", "std_conc"), "Calculated Conc", row_offset=1,
-                                 xf_env=lambda v, env: float(v) / float(env["std_conc"])),
-        },
-
-        {
-            "header": "Curve 3 - Calculated Concentration (nM)",
-            "xf":     TableValue(Rf("ms_table"), Rf("ms_sample_name", "std_conc"), "Calculated Conc", row_offset=2)
-        },
-
-        {
-            "header": "Curve 3 - Accuracy (%)",
-            "xf":     TableValue(Rf("ms_table"), Rf("ms_sample_name", "std_conc"), "Calculated Conc", row_offset=2,
-                                 xf_env=lambda v, env: float(v) / float(env["std_conc"])),
-        },
+        # one curve per replicate offset, each curve is the next row below the STD sample
+        *std_curve_columns(row_offsets=xf_env["variables"]["std_replicate_offsets"]),
 
         {
             "header": "Curve 4 - Calculated Concentration (nM)",
@@ -173,90 +209,7 @@ qc_replicate_sheet_def_odd = {
             "header": "Nominal Concentration (nM)",
             "xf": Rf("qc_conc")
         },
-        {
-            "header": "1 - Calculated Concentration (nM)",
-            "xf": TableValue(
-                Rf("ms_table"),
-                Rf("qc_label", "qc_conc"),
-                "Calculated Conc",
-                cmp=b_starts_with_a,  # if we give you ULQC, and you see ULQC_#, give us that row
-                row_offset=0
-            )
-        },
-        {
-            "header": "1 - Accuracy (%)",
-            "xf": TableValue(
-                Rf("ms_table"),
-                Rf("qc_label", "qc_conc"),
-                "Calculated Conc",
-                cmp=b_starts_with_a,
-                row_offset=0,
-                xf_env=lambda v, env: float(v) / float(env["qc_conc"])  # accuracy as a fraction
-            ),
-        },
-        {
-            "header": "3 - Calculated Concentration (nM)",
-            "xf": TableValue(
-                Rf("ms_table"),
-                Rf("qc_label", "qc_conc"),
-                "Calculated Conc",
-                cmp=b_starts_with_a,  # if we give you ULQC, and you see ULQC_#, give us that row
-                row_offset=2,
-            ),
-        },
-        {
-            "header": "3 - Accuracy (%)",
-            "xf": TableValue(
-                Rf("ms_table"),
-                Rf("qc_label", "qc_conc"),
-                "Calculated Conc",
-                cmp=b_starts_with_a,
-                row_offset=2,
-                xf_env=lambda v, env: float(v) / float(env["qc_conc"])  # accuracy as a fraction
-            ),
-        },
-        {
-            "header": "5 - Calculated Concentration (nM)",
-            "xf": TableValue(
-                Rf("ms_table"),
-                Rf("qc_label", "qc_conc"),
-                "Calculated Conc",
-                cmp=b_starts_with_a,  # if we give you ULQC, and you see ULQC_#, give us that row
-                row_offset=4,
-            ),
-        },
-        {
-            "header": "5 - Accuracy (%)",
-            "xf": TableValue(
-                Rf("ms_table"),
-                Rf("qc_label", "qc_conc"),
-                "Calculated Conc",
-                cmp=b_starts_with_a,
-                row_offset=4,
-                xf_env=lambda v, env: float(v) / float(env["qc_conc"])  # accuracy as a fraction
-            ),
-        },
-        {
-            "header": "7 - Calculated Concentration (nM)",
-            "xf": TableValue(
-                Rf("ms_table"),
-                Rf("qc_label", "qc_conc"),
-                "Calculated Conc",
-                cmp=b_starts_with_a,  # if we give you ULQC, and you see ULQC_#, give us that row
-                row_offset=6,
-            ),
-        },
-        {
-            "header": "7 - Accuracy (%)",
-            "xf": TableValue(
-                Rf("ms_table"),
-                Rf("qc_label", "qc_conc"),
-                "Calculated Conc",
-                cmp=b_starts_with_a,
-                row_offset=6,
-                xf_env=lambda v, env: float(v) / float(env["qc_conc"])  # accuracy as a fraction
-            ),
-        },
+        *qc_replicate_columns(replicates=[1, 3, 5, 7]),
     ]
 }
 
@@ -281,69 +234,7 @@ qc_replicate_sheet_def_even = {
             "header": "Nominal Concentration (nM)",
             "xf": Rf("qc_conc")
         },
-        {
-            "header": "2 - Calculated Concentration (nM)",
-            "xf": TableValue(
-                Rf("ms_table"),
-                Rf("qc_label", "qc_conc"),
-                "Calculated Conc",
-                cmp=b_starts_with_a,  # if we give you ULQC, and you see ULQC_#, give us that row
-                row_offset=1
-            )
-        },
-        {
-            "header": "2 - Accuracy (%)",
-            "xf": TableValue(
-                Rf("ms_table"),
-                Rf("qc_label", "qc_conc"),
-                "Calculated Conc",
-                cmp=b_starts_with_a,
-                row_offset=1,
-                xf_env=lambda v, env: float(v) / float(env["qc_conc"])  # accuracy as a fraction
-            ),
-        },
-        {
-            "header": "4 - Calculated Concentration (nM)",
-            "xf": TableValue(
-                Rf("ms_table"),
-                Rf("qc_label", "qc_conc"),
-                "Calculated Conc",
-                cmp=b_starts_with_a,  # if we give you ULQC, and you see ULQC_#, give us that row
-                row_offset=3,
-            ),
-        },
-        {
-            "header": "4 - Accuracy (%)",
-            "xf": TableValue(
-                Rf("ms_table"),
-                Rf("qc_label", "qc_conc"),
-                "Calculated Conc",
-                cmp=b_starts_with_a,
-                row_offset=3,
-                xf_env=lambda v, env: float(v) / float(env["qc_conc"])  # accuracy as a fraction
-            ),
-        },
-        {
-            "header": "6 - Calculated Concentration (nM)",
-            "xf": TableValue(
-                Rf("ms_table"),
-                Rf("qc_label", "qc_conc"),
-                "Calculated Conc",
-                cmp=b_starts_with_a,  # if we give you ULQC, and you see ULQC_#, give us that row
-                row_offset=5,
-            ),
-        },
-        {
-            "header": "6 - Accuracy (%)",
-            "xf": TableValue(
-                Rf("ms_table"),
-                Rf("qc_label", "qc_conc"),
-                "Calculated Conc",
-                cmp=b_starts_with_a,
-                row_offset=5,
-                xf_env=lambda v, env: float(v) / float(env["qc_conc"])  # accuracy as a fraction
-            ),
-        },
+        *qc_replicate_columns(replicates=[2, 4, 6]),
         {
             "header": "8 - Calculated Concentration (nM)",
             "xf": ""
@@ -366,6 +257,10 @@ class MSExtractor(XFProcessor):
     ]
 
 if __name__=="__main__":
+    from xf_env_check import check_requires
+
+    check_requires(MSExtractor.xf_env)
+
     ms_extractor = MSExtractor()
 
     process_workbooks(ms_extractor, data_only=True)
@@ -1,4 +1,5 @@
 # some tools for iteration
+import re
 from collections import OrderedDict
 from itertools import product
 
@@ -25,7 +26,6 @@ from bbc.xfutils import (
     add_suffix,
     zip_lists,
     list_xf,
-    xf_match_values,
     add_to_value,
     get_by_index
 )
@@ -38,6 +38,9 @@ bbc.xlxf.core.sheet_name_cmp = b_starts_with_a
 __doc__ = """ """
 __errors__ = """ """
 
+# STD-01 => STD 1, STD-10 => STD 10. Compiled once and applied to the whole name list in the env.
+std_name_pattern = re.compile("-0|-")
+
 xf_env = {
 
     "variables": {
@@ -82,6 +85,13 @@ xf_env = {
         "std_names": ["STD-01", "STD-02", "STD-03", "STD-04", "STD-05", "STD-06", "STD-07",
                       "STD-08", "STD-09", "STD-10", "STD-11", "STD-12", "STD-13"],
 
+        # the display names, converted in one pass rather than once per row
+        "std_sample_names": {
+            "requires": ["std_names"],
+            "type": lambda names: [std_name_pattern.sub(" ", name) for name in names],
+            "params": [Rf("std_names")],
+        },
+
         # the samle name list, and the index list... we need to zip these
         "sample_ids": {
             "requires": "std_table",
@@ -115,6 +125,81 @@ xf_env = {
     }
 }
 
+# refs shared by the columns below
+qc_table_rf = Rf("qc_table")
+std_table_rf = Rf("std_table")
+qc_name_rf = Rf("qc_name")
+
+
+def qc_row_key(replicate):
+    """The qc_table key for a QC replicate, e.g. ULQC_1 for replicate 3"""
+    return EnvRef(
+        "qc_name",
+        xf_env=add_suffix(suffix=EnvDict("replicate_suffix", replicate - 1), dereference_suffix=True))
+
+
+def std_row_key(replicate):
+    """The std_table "Index" key for a STD replicate"""
+    # the index is given by std_idx + (13 * [replicate - 1])
+    std_idx = EnvRef("std_idx") if replicate == 1 else EnvRef("std_idx", xf=add_to_value(13 * (replicate - 1)))
+    return EnvDict(
+        # this is a list of the indices and samples
+        "index_and_sample",
+        std_idx,
+        # we need the first element as an int
+        xf=get_by_index(0),
+    )
+
+
+def qc_replicate_columns(replicates, table_rf=qc_table_rf, header_prefix=""):
+    """Calculated Concentration and Accuracy columns for each QC replicate.
+
+    For a multi-analyte panel, call once per analyte with that analyte's table ref and a header prefix.
+    """
+    columns = []
+    for replicate in replicates:
+        row_key = qc_row_key(replicate)  # shared by the replicate's two columns
+        columns += [
+            {
+                "header": f"{header_prefix}{replicate} - Calculated Concentration (nM)",
+                "xf": TableValue(table_rf, row_key, "Calculated Concentration")
+            },
+            {
+                "header": f"{header_prefix}{replicate} - Accuracy (%)",
+                "xf": TableValue(table_rf, row_key, "Accuracy")
+            },
+        ]
+    return columns
+
+
+def std_replicate_columns(replicates, table_rf=std_table_rf, header_prefix=""):
+    """Calculated Concentration and Accuracy columns for each STD replicate, see qc_replicate_columns"""
+    columns = []
+    for replicate in replicates:
+        row_key = std_row_key(replicate)  # shared by the replicate's two columns
+        columns += [
+            {
+                "header": f"{header_prefix}{replicate} - Calculated Concentration (nM)",
+                "xf": TableValue(
+                    table_rf,
+                    row_key,
+                    "Calculated Concentration",
+                    allow_int_keys=True,  # to be safe with our str/int conversions
+                )
+            },
+            {
+                "header": f"{header_prefix}{replicate} - Accuracy (%)",
+                "xf": TableValue(
+                    table_rf,
+                    row_key,
+                    "Accuracy",
+                    allow_int_keys=True,  # to be safe with our str/int conversions
+                )
+            },
+        ]
+    return columns
+
+
 qc_sheet_def_odd = {
     "sheet_name": "QC Table (Odd Replicates)",
     "row_iterator": [
@@ -124,92 +209,13 @@ qc_sheet_def_odd = {
     "columns": [
         {
             "header": "Sample Name",
-            "xf": EnvDict("qc_name_map", Rf("qc_name"))
+            "xf": EnvDict("qc_name_map", qc_name_rf)
         },
         {
             "header": "Nominal Concentration (nM)",
-            "xf": TableValue(Rf("qc_table"), Rf("qc_name"), "Actual Concentration")
-        },
-        {
-            "header": "1 - Calculated Concentration (nM)",
-            "xf": TableValue(
-                Rf("qc_table"),
-                EnvRef(
-                    "qc_name",
-                    xf_env=add_suffix(suffix=EnvDict("replicate_suffix", 0), dereference_suffix=True)),
-                "Calculated Concentration"
-            )
-        },
-        {
-            "header": "1 - Accuracy (%)",
-            "xf": TableValue(
-                Rf("qc_table"),
-                EnvRef(
-                    "qc_name",
-                    xf_env=add_suffix(suffix=EnvDict("replicate_suffix", 0), dereference_suffix=True)),
-                "Accuracy"
-            )
-        },
-        {
-            "header": "3 - Calculated Concentration (nM)",
-            "xf": TableValue(
-                Rf("qc_table"),
-                EnvRef(
-                    "qc_name",
-                    xf_env=add_suffix(suffix=EnvDict("replicate_suffix", 2), dereference_suffix=True)),
-                "Calculated Concentration"
-            )
-        },
-        {
-            "header": "3 - Accuracy (%)",
-            "xf": TableValue(
-                Rf("qc_table"),
-                EnvRef(
-                    "qc_name",
-                    xf_env=add_suffix(suffix=EnvDict("replicate_suffix", 2), dereference_suffix=True)),
-                "Accuracy"
-            )
-        },
-        {
-            "header": "5 - Calculated Concentration (nM)",
-            "xf": TableValue(
-                Rf("qc_table"),
-                EnvRef(
-                    "qc_name",
-                    xf_env=add_suffix(suffix=EnvDict("replicate_suffix", 4), dereference_suffix=True)),
-                "Calculated Concentration"
-            )
-        },
-        {
-            "header": "5 - Accuracy (%)",
-            "xf": TableValue(
-                Rf("qc_table"),
-                EnvRef(
-                    "qc_name",
-                    xf_env=add_suffix(suffix=EnvDict("replicate_suffix", 4), dereference_suffix=True)),
-                "Accuracy"
-            )
-        },
-        {
-            "header": "7 - Calculated Concentration (nM)",
-            "xf": TableValue(
-                Rf("qc_table"),
-                EnvRef(
-                    "qc_name",
-                    xf_env=add_suffix(suffix=EnvDict("replicate_suffix", 6), dereference_suffix=True)),
-                "Calculated Concentration"
-            )
-        },
-        {
-            "header": "7 - Accuracy (%)",
-            "xf": TableValue(
-                Rf("qc_table"),
-                EnvRef(
-                    "qc_name",
-                    xf_env=add_suffix(suffix=EnvDict("replicate_suffix", 6), dereference_suffix=True)),
-                "Accuracy"
-            )
+            "xf": TableValue(qc_table_rf, qc_name_rf, "Actual Concentration")
         },
+        *qc_replicate_columns(replicates=[1, 3, 5, 7]),
     ]
 }
 
@@ -222,72 +228,13 @@ qc_sheet_def_even = {
     "columns": [
         {
             "header": "Sample Name",
-            "xf": EnvDict("qc_name_map", Rf("qc_name"))
+            "xf": EnvDict("qc_name_map", qc_name_rf)
         },
         {
             "header": "Nominal Concentration (nM)",
-            "xf": TableValue(Rf("qc_table"), Rf("qc_name"), "Actual Concentration")
-        },
-        {
-            "header": "2 - Calculated Concentration (nM)",
-            "xf": TableValue(
-                Rf("qc_table"),
-                EnvRef(
-                    "qc_name",
-                    xf_env=add_suffix(suffix=EnvDict("replicate_suffix", 1), dereference_suffix=True)),
-                "Calculated Concentration"
-            )
-        },
-        {
-            "header": "2 - Accuracy (%)",
-            "xf": TableValue(
-                Rf("qc_table"),
-                EnvRef(
-                    "qc_name",
-                    xf_env=add_suffix(suffix=EnvDict("replicate_suffix", 1), dereference_suffix=True)),
-                "Accuracy"
-            )
-        },
-        {
-            "header": "4 - Calculated Concentration (nM)",
-            "xf": TableValue(
-                Rf("qc_table"),
-                EnvRef(
-                    "qc_name",
-                    xf_env=add_suffix(suffix=EnvDict("replicate_suffix", 3), dereference_suffix=True)),
-                "Calculated Concentration"
-            )
-        },
-        {
-            "header": "4 - Accuracy (%)",
-            "xf": TableValue(
-                Rf("qc_table"),
-                EnvRef(
-                    "qc_name",
-                    xf_env=add_suffix(suffix=EnvDict("replicate_suffix", 3), dereference_suffix=True)),
-                "Accuracy"
-            )
-        },
-        {
-            "header": "6 - Calculated Concentration (nM)",
-            "xf": TableValue(
-                Rf("qc_table"),
-                EnvRef(
-                    "qc_name",
-                    xf_env=add_suffix(suffix=EnvDict("replicate_suffix", 5), dereference_suffix=True)),
-                "Calculated Concentration"
-            )
-        },
-        {
-            "header": "6 - Accuracy (%)",
-            "xf": TableValue(
-                Rf("qc_table"),
-                EnvRef(
-                    "qc_name",
-                    xf_env=add_suffix(suffix=EnvDict("replicate_suffix", 5), dereference_suffix=True)),
-                "Accuracy"
-            )
+            "xf": TableValue(qc_table_rf, qc_name_rf, "Actual Concentration")
         },
+        *qc_replicate_columns(replicates=[2, 4, 6]),
         {
             "header": "8 - Calculated Concentration (nM)",
             "xf": ""
@@ -308,125 +255,20 @@ std_sheet_def = {
     "columns": [
         {
             "header": "Sample Name",
-            "xf": EnvDict(
-                "std_names",
-                Rf("std_idx"),
-                xf=xf_match_values(patterns="-0|-", re=True, substitute=True, replace=" ")
-            )
+            "xf": EnvDict("std_sample_names", Rf("std_idx"))
         },
         {
             "header": "Nominal Concentration (nM)",
             "xf": TableValue(
-                Rf("std_table"),
-                EnvDict(
-                    # this is a list of the indices and samples
-                    "index_and_sample",
-                    EnvRef("std_idx"),
-                    # we need the first element as an int
-                    xf=get_by_index(0),
-                ),
+                std_table_rf,
+                std_row_key(1),  # the nominal concentration is read from the first curve
                 "Actual Concentration",
                 allow_int_keys=True,  # to be safe with our str/int conversions
             )
         },
+        *std_replicate_columns(replicates=[1, 2, 3]),
         {
-            "header": "1 - Caclulated Concentration (nM)",
-            "xf": TableValue(
-                Rf("std_table"),
-                EnvDict(
-                    # this is a list of the indices and samples
-                    "index_and_sample",
-                    # the index is given by std_idx + (13 * [replicate - 1])
-                    EnvRef("std_idx"),
-                    # we need the first element as an int
-                    xf=get_by_index(0),
-                ),
-                "Calculated Concentration",
-                allow_int_keys=True,  # to be safe with our str/int conversions
-            )
-        },
-        {
-            "header": "1 - Accuracy (%)",
-            "xf": TableValue(
-                Rf("std_table"),
-                EnvDict(
-                    # this is a list of the indices and samples
-                    "index_and_sample",
-                    # the index is given by std_idx + (13 * [replicate - 1])
-                    EnvRef("std_idx"),
-                    # we need the first element as an int
-                    xf=get_by_index(0),
-                ),
-                "Accuracy",
-                allow_int_keys=True,  # to be safe with our str/int conversions
-            )
-        },
-        {
-            "header": "2 - Caclulated Concentration (nM)",
-            "xf": TableValue(  # STD-02, block 2: "index" = 218, std_idx = 1
-                Rf("std_table"),
-                EnvDict( # => index_and_sample[1+13] => index_and_sample[14] = (218, STD-02)
-                    # this is a list of the indices and samples
-                    "index_and_sample",
-                    # the index is given by std_idx + (13 * [replicate - 1])
-                    EnvRef("std_idx", xf=add_to_value(13)),
-                    # we need the first element as an int
-                    xf=get_by_index(0),
-                ), # => 218
-                "Calculated Concentration",
-                allow_int_keys=True,  # to be safe with our str/int conversions
-            )
-        },
-        {
-            "header": "2 - Accuracy (%)",
-            "xf": TableValue(
-                Rf("std_table"),
-                EnvDict(
-                    # this is a list of the indices and samples
-                    "index_and_sample",
-                    # the index is given by std_idx + (13 * [replicate - 1])
-                    EnvRef("std_idx", xf=add_to_value(13)),
-                    # we need the first element as an int
-                    xf=get_by_index(0),
-                ),
-                "Accuracy",
-                allow_int_keys=True,  # to be safe with our str/int conversions
-            )
-        },
-        {
-            "header": "3 - Caclulated Concentration (nM)",
-            "xf": TableValue(
-                Rf("std_table"),
-                EnvDict(
-                    # this is a list of the indices and samples
-                    "index_and_sample",
-                    # the index is given by std_idx + (13 * [replicate - 1])
-                    EnvRef("std_idx", xf=add_to_value(26)),
-                    # we need the first element as an int
-                    xf=get_by_index(0),
-                ),
-                "Calculated Concentration",
-                allow_int_keys=True,  # to be safe with our str/int conversions
-            )
-        },
-        {
-            "header": "3 - Accuracy (%)",
-            "xf": TableValue(
-                Rf("std_table"),
-                EnvDict(
-                    # this is a list of the indices and samples
-                    "index_and_sample",
-                    # the index is given by std_idx + (13 * [replicate - 1])
-                    EnvRef("std_idx", xf=add_to_value(26)),
-                    # we need the first element as an int
-                    xf=get_by_index(0),
-                ),
-                "Accuracy",
-                allow_int_keys=True,  # to be safe with our str/int conversions
-            )
-        },
-        {
-            "header": "4 - Caclulated Concentration (nM)",
+            "header": "4 - Calculated Concentration (nM)",
             "xf": ""
         },
         {
@@ -449,6 +291,9 @@ class Assay(XFProcessor):
 
 if __name__ == "__main__":
     import os.path
+    from xf_env_check import check_requires
+
+    check_requires(Assay.xf_env)
 
     _assay = Assay()
     process_workbooks(_assay, data_only=True, print_env=False)
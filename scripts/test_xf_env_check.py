@@ -0,0 +1,64 @@
+import importlib.util
+from pathlib import Path
+
+import pytest
+
+from xf_env_check import check_requires
+
+
+class Ref:
+    """Stand-in for bbc.xlxf.Rf"""
+
+    def __init__(self, *names):
+        self.names = names
+
+
+def check(variables):
+    check_requires({"variables": variables}, ref_types=(Ref,))
+
+
+def test_valid_env():
+    check({
+        "a": 1,
+        "b": {"requires": "a", "type": list, "params": [Ref("a")]},
+        "c": {"requires": ["a", "b"], "type": zip, "params": {"x": Ref("a"), "y": [Ref("b")]}},
+    })
+
+
+def test_unknown_requires():
+    with pytest.raises(ValueError, match="'b' requires unknown variable 'zz'"):
+        check({"b": {"requires": ["zz"]}})
+
+
+def test_cycle():
+    with pytest.raises(ValueError, match="requires cycle: a -> b -> a"):
+        check({"a": {"requires": "b"}, "b": {"requires": ["a"]}})
+
+
+def test_self_cycle():
+    with pytest.raises(ValueError, match="requires cycle: a -> a"):
+        check({"a": {"requires": "a"}})
+
+
+def test_ref_missing_from_requires():
+    with pytest.raises(ValueError, match="'b' params refer to 'a', which is missing from its requires"):
+        check({"a": 1, "b": {"type": list, "params": [Ref("a")]}})
+
+
+def test_ref_to_unknown_variable():
+    with pytest.raises(ValueError, match="'b' params refer to unknown variable 'zz'"):
+        check({"b": {"type": list, "params": {"table": Ref("zz")}}})
+
+
+@pytest.mark.parametrize("loader, processor", [
+    ("pk_ms_example.py", "MSExtractor"),
+    ("pk_ms_example_v2.py", "Assay"),
+])
+def test_example_loaders(loader, processor):
+    pytest.importorskip("bbc.xlxf")
+
+    spec = importlib.util.spec_from_file_location("loader", Path(__file__).parent / loader)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+
+    check_requires(getattr(module, processor).xf_env)
@@ -0,0 +1,107 @@
+"""Static pre-flight checks for an xf_env, run before any workbook is opened
+
+Usage: python scripts/xf_env_check.py scripts/pk_ms_example_v2.py Assay
+"""
+
+
+def _requires(spec):
+    # "requires" may be a single variable name or a list of names
+    if not isinstance(spec, dict):
+        return []
+    requires = spec.get("requires", [])
+    if isinstance(requires, str):
+        return [requires]
+    return list(requires)
+
+
+def _strings(value):
+    if isinstance(value, str):
+        return [value]
+    if isinstance(value, (list, tuple)):
+        return [s for item in value for s in _strings(item)]
+    return []
+
+
+def _ref_names(value, ref_types):
+    """The env names referred to by every ref inside a params value"""
+    if isinstance(value, ref_types):
+        # a ref only holds its target names as strings, so read those off the instance rather than depend on how
+        # bbc.xlxf names its attributes
+        attrs = list(getattr(value, "__dict__", {}).values())
+        for cls in type(value).__mro__:
+            attrs += [getattr(value, slot) for slot in getattr(cls, "__slots__", ()) if hasattr(value, slot)]
+        return _strings(attrs)
+    if isinstance(value, dict):
+        value = list(value.values())
+    if isinstance(value, (list, tuple)):
+        return [name for item in value for name in _ref_names(item, ref_types)]
+    return []
+
+
+def check_requires(xf_env, ref_types=None):
+    """Check that every "requires" entry names a variable in the env, that every ref in a variable's params is
+    listed in its "requires", and that the requires graph has no cycles.
+
+    ref_types defaults to (Rf, EnvRef) from bbc.xlxf. Raises a ValueError listing every problem found.
+    """
+    if ref_types is None:
+        from bbc.xlxf import EnvRef, Rf
+        ref_types = (Rf, EnvRef)
+
+    variables = xf_env.get("variables", {})
+    errors = []
+
+    for name, spec in variables.items():
+        requires = _requires(spec)
+        for required in requires:
+            if required not in variables:
+                errors.append(f"'{name}' requires unknown variable '{required}'")
+
+        if not isinstance(spec, dict):
+            continue
+        for ref in dict.fromkeys(_ref_names(spec.get("params"), ref_types)):
+            if ref not in variables:
+                errors.append(f"'{name}' params refer to unknown variable '{ref}'")
+            elif ref not in requires:
+                errors.append(f"'{name}' params refer to '{ref}', which is missing from its requires")
+
+    # depth-first walk, tracking the current path to report the cycle itself
+    done = set()
+
+    def visit(name, path):
+        if name in done or name not in variables:
+            return
+        if name in path:
+            cycle = path[path.index(name):] + [name]
+            errors.append("requires cycle: " + " -> ".join(cycle))
+            return
+        for required in _requires(variables[name]):
+            visit(required, path + [name])
+        done.add(name)
+
+    for name in variables:
+        visit(name, [])
+
+    if errors:
+        raise ValueError("invalid xf_env:\n  " + "\n  ".join(errors))
+
+
+if __name__ == "__main__":
+    import argparse
+    import importlib.util
+    import sys
+
+    parser = argparse.ArgumentParser(description="Check a loader's xf_env without reading any workbooks")
+    parser.add_argument("loader", help="path to the loader script, e.g. scripts/pk_ms_example_v2.py")
+    parser.add_argument("processor", help="name of the XFProcessor class in the loader, e.g. Assay")
+    args = parser.parse_args()
+
+    spec = importlib.util.spec_from_file_location("loader", args.loader)
+    loader = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(loader)
+
+    try:
+        check_requires(getattr(loader, args.processor).xf_env)
+    except ValueError as e:
+        sys.exit(str(e))
+    print(f"{args.processor}: xf_env ok")